@@ -0,0 +1,39 @@
+"""add admin filter indexes
+
+Revision ID: 5b1c7e2a9d40
+Revises: 2d37a01bfe19
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1c7e2a9d40'
+down_revision = '2d37a01bfe19'
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    'ix_req_status_created': 'status',
+    'ix_req_priority_created': 'priority',
+    'ix_req_chemist_created': 'chemist_id',
+    'ix_req_analyst_created': 'analyst_id',
+}
+
+
+def upgrade() -> None:
+    for name, column in _INDEXES.items():
+        op.create_index(
+            name,
+            'analysis_requests',
+            [column, sa.text('created_at DESC')],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        op.drop_index(name, table_name='analysis_requests')
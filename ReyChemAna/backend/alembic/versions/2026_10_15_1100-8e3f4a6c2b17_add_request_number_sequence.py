@@ -0,0 +1,24 @@
+"""add request_number sequence
+
+Revision ID: 8e3f4a6c2b17
+Revises: 5b1c7e2a9d40
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3f4a6c2b17'
+down_revision = '5b1c7e2a9d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('request_number_seq', start=1)))
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence('request_number_seq')))
@@ -0,0 +1,26 @@
+"""add result_files file_type and file_size
+
+Revision ID: c41d9b7e5f02
+Revises: 8e3f4a6c2b17
+Create Date: 2026-10-15 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d9b7e5f02'
+down_revision = '8e3f4a6c2b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('result_files', sa.Column('file_type', sa.String(length=100), nullable=True))
+    op.add_column('result_files', sa.Column('file_size', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('result_files', 'file_size')
+    op.drop_column('result_files', 'file_type')
@@ -0,0 +1,61 @@
+"""denormalize chemist/analyst names onto analysis_requests
+
+Revision ID: f2a6c8d1e934
+Revises: c41d9b7e5f02
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6c8d1e934'
+down_revision = 'c41d9b7e5f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('analysis_requests', sa.Column('chemist_name', sa.String(length=100), nullable=True))
+    op.add_column('analysis_requests', sa.Column('analyst_name', sa.String(length=100), nullable=True))
+
+    # Backfill from users
+    op.execute("""
+        UPDATE analysis_requests ar
+        SET chemist_name = u.full_name
+        FROM users u
+        WHERE u.id = ar.chemist_id
+    """)
+    op.execute("""
+        UPDATE analysis_requests ar
+        SET analyst_name = u.full_name
+        FROM users u
+        WHERE u.id = ar.analyst_id
+    """)
+    op.alter_column('analysis_requests', 'chemist_name', nullable=False)
+
+    # Keep the copies in sync when a user is renamed
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sync_request_user_names() RETURNS trigger AS $$
+        BEGIN
+            UPDATE analysis_requests SET chemist_name = NEW.full_name WHERE chemist_id = NEW.id;
+            UPDATE analysis_requests SET analyst_name = NEW.full_name WHERE analyst_id = NEW.id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER users_full_name_sync
+        AFTER UPDATE OF full_name ON users
+        FOR EACH ROW
+        WHEN (OLD.full_name IS DISTINCT FROM NEW.full_name)
+        EXECUTE FUNCTION sync_request_user_names()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_full_name_sync ON users")
+    op.execute("DROP FUNCTION IF EXISTS sync_request_user_names()")
+    op.drop_column('analysis_requests', 'analyst_name')
+    op.drop_column('analysis_requests', 'chemist_name')
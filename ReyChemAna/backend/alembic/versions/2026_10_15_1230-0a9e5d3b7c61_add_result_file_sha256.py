@@ -0,0 +1,26 @@
+"""add result_files sha256
+
+Revision ID: 0a9e5d3b7c61
+Revises: f2a6c8d1e934
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a9e5d3b7c61'
+down_revision = 'f2a6c8d1e934'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('result_files', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_result_files_sha256'), 'result_files', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_result_files_sha256'), table_name='result_files')
+    op.drop_column('result_files', 'sha256')
@@ -0,0 +1,30 @@
+"""add request keyset index
+
+Revision ID: 7d2b9e4f1a83
+Revises: 0a9e5d3b7c61
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2b9e4f1a83'
+down_revision = '0a9e5d3b7c61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the (created_at, id) keyset used by the request lists
+    op.create_index(
+        'ix_req_created_id',
+        'analysis_requests',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_req_created_id', table_name='analysis_requests')
@@ -0,0 +1,38 @@
+"""make analyst list index partial
+
+Revision ID: 3c8e1f6a2d45
+Revises: 7d2b9e4f1a83
+Create Date: 2026-10-15 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8e1f6a2d45'
+down_revision = '7d2b9e4f1a83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Pending requests have no analyst; leave them out of the index
+    op.drop_index('ix_req_analyst_created', table_name='analysis_requests')
+    op.create_index(
+        'ix_req_analyst_created',
+        'analysis_requests',
+        ['analyst_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_where=sa.text('analyst_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_req_analyst_created', table_name='analysis_requests')
+    op.create_index(
+        'ix_req_analyst_created',
+        'analysis_requests',
+        ['analyst_id', sa.text('created_at DESC')],
+        unique=False,
+    )
@@ -0,0 +1,50 @@
+"""store enums as strings
+
+Revision ID: 9a4d2c7e6b18
+Revises: 3c8e1f6a2d45
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d2c7e6b18'
+down_revision = '3c8e1f6a2d45'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, PG enum type, member names)
+_ENUM_COLUMNS = [
+    ('users', 'role', 'userrole', ('CHEMIST', 'ANALYST', 'ADMIN')),
+    ('analysis_requests', 'priority', 'priority', ('LOW', 'MEDIUM', 'HIGH', 'URGENT')),
+    ('analysis_requests', 'status', 'requeststatus', ('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED')),
+]
+
+
+def upgrade() -> None:
+    # Native ENUMs stored member names; the columns now hold the values
+    # (the lowercase strings the API already uses)
+    for table, column, type_name, _ in _ENUM_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(20),
+            existing_nullable=False,
+            postgresql_using=f'lower({column}::text)',
+        )
+        op.execute(f'DROP TYPE {type_name}')
+
+
+def downgrade() -> None:
+    for table, column, type_name, names in _ENUM_COLUMNS:
+        sa.Enum(*names, name=type_name).create(op.get_bind())
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Enum(*names, name=type_name),
+            existing_nullable=False,
+            postgresql_using=f'upper({column})::{type_name}',
+        )
@@ -0,0 +1,45 @@
+"""add request child indexes
+
+Revision ID: b5e7f3a1c962
+Revises: 9a4d2c7e6b18
+Create Date: 2026-10-15 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e7f3a1c962'
+down_revision = '9a4d2c7e6b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Chemist's own list filtered by status
+    op.create_index(
+        'ix_req_chemist_status_created',
+        'analysis_requests',
+        ['chemist_id', 'status', sa.text('created_at DESC')],
+        unique=False,
+    )
+    # Foreign keys the request loaders look up by (no index until now)
+    op.create_index(
+        'ix_rat_request_type',
+        'request_analysis_types',
+        ['request_id', 'analysis_type_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_result_files_request_id',
+        'result_files',
+        ['request_id', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_result_files_request_id', table_name='result_files')
+    op.drop_index('ix_rat_request_type', table_name='request_analysis_types')
+    op.drop_index('ix_req_chemist_status_created', table_name='analysis_requests')
@@ -0,0 +1,37 @@
+"""store result_files.uploaded_at with time zone
+
+Revision ID: d8c2a6f4e1b7
+Revises: b5e7f3a1c962
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8c2a6f4e1b7'
+down_revision = 'b5e7f3a1c962'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing values were written with datetime.utcnow()
+    op.execute("UPDATE result_files SET uploaded_at = now() AT TIME ZONE 'UTC' WHERE uploaded_at IS NULL")
+    op.alter_column('result_files', 'uploaded_at',
+               existing_type=sa.DateTime(),
+               type_=postgresql.TIMESTAMP(timezone=True),
+               nullable=False,
+               server_default=sa.text('now()'),
+               postgresql_using="uploaded_at AT TIME ZONE 'UTC'")
+
+
+def downgrade() -> None:
+    op.alter_column('result_files', 'uploaded_at',
+               existing_type=postgresql.TIMESTAMP(timezone=True),
+               type_=sa.DateTime(),
+               nullable=True,
+               server_default=sa.text('now()'),
+               postgresql_using="uploaded_at AT TIME ZONE 'UTC'")
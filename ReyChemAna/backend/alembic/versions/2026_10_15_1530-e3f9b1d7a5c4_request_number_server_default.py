@@ -0,0 +1,46 @@
+"""generate request_number in the database
+
+Revision ID: e3f9b1d7a5c4
+Revises: d8c2a6f4e1b7
+Create Date: 2026-10-15 15:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3f9b1d7a5c4'
+down_revision = 'd8c2a6f4e1b7'
+branch_labels = None
+depends_on = None
+
+
+# REQ-DDMONYY-NNNN (UTC date), same format the API used to build;
+# a function because a DEFAULT can't reuse the nextval() result
+_CREATE_FUNCTION = """
+CREATE FUNCTION next_request_number() RETURNS varchar AS $$
+DECLARE
+    n text := nextval('request_number_seq')::text;
+BEGIN
+    RETURN 'REQ-' || to_char(now() AT TIME ZONE 'UTC', 'DDMONYY')
+        || '-' || lpad(n, greatest(4, length(n)), '0');
+END;
+$$ LANGUAGE plpgsql VOLATILE
+"""
+
+
+def upgrade() -> None:
+    op.execute(_CREATE_FUNCTION)
+    op.alter_column('analysis_requests', 'request_number',
+               existing_type=sa.String(length=20),
+               existing_nullable=False,
+               server_default=sa.text('next_request_number()'))
+
+
+def downgrade() -> None:
+    op.alter_column('analysis_requests', 'request_number',
+               existing_type=sa.String(length=20),
+               existing_nullable=False,
+               server_default=None)
+    op.execute('DROP FUNCTION next_request_number()')
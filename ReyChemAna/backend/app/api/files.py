@@ -7,33 +7,43 @@ Supports:
 - Backward compatibility with existing files
 """
 
-import shutil
-from typing import List
+import hashlib
+import mimetypes
+import os
+import stat
+import uuid
+from typing import List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import quote
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     HTTPException,
     status,
     UploadFile,
     File,
 )
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from sqlalchemy.orm import Session, lazyload
 
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.core.permissions import require_analyst, require_any_role
+from app.core.responses import ZeroCopyFileResponse
 from app.models import AnalysisRequest, ResultFile
 from app.models.user import User, UserRole
-from app.schemas.request import ResultFileResponse
+from app.schemas.request import RESULT_FILE_LIST_ADAPTER, ResultFileResponse
 from app.config import settings
-from app.utils.audit import log_file_upload, log_action
+from app.utils.audit import log_file_uploads_background, log_action_background
 
 router = APIRouter(prefix="/files", tags=["File Management"])
 
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+_UPLOAD_ROOT = Path(settings.UPLOAD_DIR)
+
 
 # ============================================================
 # 🔹 INTERNAL HELPERS (OPTION-2B)
@@ -46,7 +56,7 @@ def _get_request_upload_dir(request_number: str) -> Path:
     uploads/
       └── 2026/
           └── JAN/
-              └── REQ-18JAN26-02/
+              └── REQ-18JAN26-0002/
                   ├── result1.pdf
                   └── result2.xlsx
 
@@ -57,13 +67,107 @@ def _get_request_upload_dir(request_number: str) -> Path:
     year = str(now.year)
     month = now.strftime("%b").upper()  # JAN, FEB, MAR
 
-    base_dir = Path(settings.UPLOAD_DIR)
-    request_dir = base_dir / year / month / request_number
+    request_dir = _UPLOAD_ROOT / year / month / request_number
     request_dir.mkdir(parents=True, exist_ok=True)
 
     return request_dir
 
 
+def _scope_to_user(query, current_user: User):
+    """
+    Chemists only see their own requests; filter in SQL so other
+    users' rows never leave the DB (and look the same as missing ones)
+    """
+    if current_user.role == UserRole.CHEMIST:
+        query = query.filter(AnalysisRequest.chemist_id == current_user.id)
+    return query
+
+
+def _stat_open(path: Path):
+    """
+    Open a stored file, then fstat the descriptor (no separate stat/exists)
+    Returns (stat_result, fd); raises FileNotFoundError if it is gone
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        stat_result = os.fstat(fd)
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise FileNotFoundError(path)
+    except BaseException:
+        os.close(fd)
+        raise
+    return stat_result, fd
+
+
+def _remove_stored_file(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _reject_too_large(upload: UploadFile, partial_path: Optional[Path] = None):
+    if partial_path is not None:
+        partial_path.unlink(missing_ok=True)
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{upload.filename} exceeds max file size",
+    )
+
+
+def _save_upload(upload: UploadFile, file_path: Path) -> Tuple[int, str]:
+    """
+    Write an uploaded file to disk, enforcing the size limit while copying
+    Returns (bytes written, SHA-256 hex digest), hashed in the same pass
+    """
+    limit = settings.max_file_size_bytes
+
+    # Starlette knows the size up front: reject before touching the disk
+    if upload.size is not None and upload.size > limit:
+        _reject_too_large(upload)
+
+    written = 0
+    digest = hashlib.sha256()
+    with file_path.open("wb") as buffer:
+        while chunk := upload.file.read(_UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > limit:
+                buffer.close()
+                _reject_too_large(upload, file_path)
+            digest.update(chunk)
+            buffer.write(chunk)
+
+    return written, digest.hexdigest()
+
+
+def _link_duplicates(db: Session, records: List[ResultFile]) -> None:
+    """
+    Replace newly written files whose content is already stored (or
+    appears earlier in the same batch) with a hard link to that copy
+    (falls back to keeping the copy)
+    """
+    stored = dict(
+        db.query(ResultFile.sha256, ResultFile.file_path)
+        .filter(ResultFile.sha256.in_({record.sha256 for record in records}))
+        .all()
+    )
+
+    for record in records:
+        existing = stored.get(record.sha256)
+        if existing is None:
+            # First copy of this content: later files in the batch link to it
+            stored[record.sha256] = record.file_path
+            continue
+
+        target = _UPLOAD_ROOT / record.file_path
+        staged = target.with_name(target.name + ".link")
+        try:
+            os.link(_UPLOAD_ROOT / existing, staged)
+            os.replace(staged, target)
+        except OSError:
+            staged.unlink(missing_ok=True)
+
+
 # ============================================================
 # 📤 UPLOAD FILES (ANALYST ONLY)
 # ============================================================
@@ -72,78 +176,83 @@ def _get_request_upload_dir(request_number: str) -> Path:
     "/upload/{request_id}",
     response_model=List[ResultFileResponse],
 )
-async def upload_files(
+def upload_files(
     request_id: int,
+    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_analyst),
 ):
-    request = (
-        db.query(AnalysisRequest)
-        .filter(AnalysisRequest.id == request_id)
-        .first()
-    )
+    # Only the request number is needed: skip the eager collections
+    request = db.get(AnalysisRequest, request_id, options=[lazyload("*")])
 
     if not request:
         raise HTTPException(404, "Request not found")
 
     upload_dir = _get_request_upload_dir(request.request_number)
     uploaded_records: List[ResultFile] = []
-
-    for upload in files:
-        # --- Size validation ---
-        upload.file.seek(0, 2)
-        size = upload.file.tell()
-        upload.file.seek(0)
-
-        if size > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"{upload.filename} exceeds max file size",
+    written_paths: List[Path] = []
+
+    try:
+        for upload in files:
+            # --- Unique on-disk name (original name is kept for display) ---
+            original_name = Path(upload.filename).name
+            stem, suffix = Path(original_name).stem, Path(original_name).suffix
+            file_path = upload_dir / f"{stem}_{uuid.uuid4().hex[:8]}{suffix}"
+
+            # --- Save file (size limit enforced while copying) ---
+            file_size, sha256 = _save_upload(upload, file_path)
+            written_paths.append(file_path)
+
+            # --- DB record (inserted together after the loop) ---
+            relative_path = str(
+                file_path.relative_to(_UPLOAD_ROOT)
             )
 
-        # --- Filename conflict handling ---
-        file_path = upload_dir / upload.filename
-        counter = 1
-
-        while file_path.exists():
-            stem = file_path.stem
-            suffix = file_path.suffix
-            file_path = upload_dir / f"{stem}_{counter}{suffix}"
-            counter += 1
-
-        # --- Save file ---
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(upload.file, buffer)
-
-        # --- DB record ---
-        relative_path = str(
-            file_path.relative_to(Path(settings.UPLOAD_DIR))
-        )
-
-        db_file = ResultFile(
-            request_id=request.id,
-            uploaded_by=current_user.id,
-            file_name=file_path.name,
-            file_path=relative_path,
-        )
-
-        db.add(db_file)
+            uploaded_records.append(ResultFile(
+                request_id=request.id,
+                uploaded_by=current_user.id,
+                file_name=original_name,
+                file_path=relative_path,
+                file_type=(
+                    mimetypes.guess_type(original_name)[0]
+                    or "application/octet-stream"
+                ),
+                file_size=file_size,
+                sha256=sha256,
+            ))
+
+        # --- Same content already stored: keep one copy on disk ---
+        _link_duplicates(db, uploaded_records)
+
+        # One flush for the batch; build the response before commit
+        # expires the rows (avoids a refresh SELECT per file)
+        db.add_all(uploaded_records)
         db.flush()
-        db.refresh(db_file)
-
-        uploaded_records.append(db_file)
-
-        log_file_upload(
-            db=db,
-            user=current_user,
-            request_id=request.id,
-            file_name=file_path.name,
+        response = RESULT_FILE_LIST_ADAPTER.dump_json(
+            RESULT_FILE_LIST_ADAPTER.validate_python(
+                uploaded_records, from_attributes=True
+            )
         )
+        audit_user_id, audit_request_id = current_user.id, request.id
+        audit_file_names = [record.file_name for record in uploaded_records]
+        db.commit()
+    except Exception:
+        # Don't leave files from a rejected or failed batch behind
+        for path in written_paths:
+            path.unlink(missing_ok=True)
+        raise
+
+    background_tasks.add_task(
+        log_file_uploads_background,
+        user_id=audit_user_id,
+        request_id=audit_request_id,
+        file_names=audit_file_names,
+    )
 
-    db.commit()
-    return uploaded_records
+    # Already serialised: skip FastAPI's response_model pass
+    return Response(content=response, media_type="application/json")
 
 
 # ============================================================
@@ -151,54 +260,71 @@ async def upload_files(
 # ============================================================
 
 @router.get("/download/{file_id}")
-async def download_file(
+def download_file(
     file_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_any_role),
 ):
-    file_record = (
+    # File and its request in one round-trip, scoped to the caller
+    file_record = _scope_to_user(
         db.query(ResultFile)
-        .filter(ResultFile.id == file_id)
-        .first()
-    )
+        .join(AnalysisRequest, ResultFile.request_id == AnalysisRequest.id)
+        .filter(ResultFile.id == file_id),
+        current_user,
+    ).first()
 
     if not file_record:
         raise HTTPException(404, "File not found")
 
-    request = (
-        db.query(AnalysisRequest)
-        .filter(AnalysisRequest.id == file_record.request_id)
-        .first()
-    )
-
-    if not request:
-        raise HTTPException(404, "Associated request not found")
-
-    if (
-        current_user.role == UserRole.CHEMIST
-        and request.chemist_id != current_user.id
-    ):
-        raise HTTPException(403, "Access denied")
+    absolute_path = _UPLOAD_ROOT / file_record.file_path
 
-    absolute_path = Path(settings.UPLOAD_DIR) / file_record.file_path
-
-    if not absolute_path.exists():
-        raise HTTPException(404, "File missing on disk")
+    if settings.USE_XACCEL:
+        if not absolute_path.exists():
+            raise HTTPException(404, "File missing on disk")
+    else:
+        # Stat + open once here; the response reuses both
+        try:
+            stat_result, fd = _stat_open(absolute_path)
+        except FileNotFoundError:
+            raise HTTPException(404, "File missing on disk")
 
-    log_action(
-        db=db,
-        user=current_user,
+    background_tasks.add_task(
+        log_action_background,
+        user_id=current_user.id,
         action="download_file",
         entity_type="file",
         entity_id=file_id,
         details=f"Downloaded file: {file_record.file_name}",
     )
 
-    return FileResponse(
+    # Files uploaded before file_type was recorded have none
+    media_type = file_record.file_type or "application/octet-stream"
+
+    if settings.USE_XACCEL:
+        # nginx streams the file itself; we only authorize the request
+        internal_path = (
+            settings.XACCEL_PREFIX.rstrip("/") + "/"
+            + file_record.file_path.replace("\\", "/")
+        )
+        return Response(
+            status_code=status.HTTP_200_OK,
+            media_type=media_type,
+            headers={
+                "X-Accel-Redirect": quote(internal_path),
+                "Content-Disposition": (
+                    f"attachment; filename*=utf-8''{quote(file_record.file_name)}"
+                ),
+            },
+        )
+
+    return ZeroCopyFileResponse(
         path=str(absolute_path),
+        fd=fd,
+        stat_result=stat_result,
         filename=file_record.file_name,
-        media_type="application/octet-stream",
+        media_type=media_type,
     )
 
 
@@ -210,31 +336,35 @@ async def download_file(
     "/request/{request_id}",
     response_model=List[ResultFileResponse],
 )
-async def list_request_files(
+def list_request_files(
     request_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_any_role),
 ):
-    request = (
-        db.query(AnalysisRequest)
-        .filter(AnalysisRequest.id == request_id)
-        .first()
-    )
-
-    if not request:
-        raise HTTPException(404, "Request not found")
-
-    if (
-        current_user.role == UserRole.CHEMIST
-        and request.chemist_id != current_user.id
-    ):
-        raise HTTPException(403, "Access denied")
-
-    return (
+    files = _scope_to_user(
         db.query(ResultFile)
-        .filter(ResultFile.request_id == request_id)
-        .all()
+        .join(AnalysisRequest, ResultFile.request_id == AnalysisRequest.id)
+        .filter(ResultFile.request_id == request_id),
+        current_user,
+    ).all()
+
+    # No rows: either the request has no files yet or the caller can't see it
+    if not files:
+        visible = _scope_to_user(
+            db.query(AnalysisRequest.id)
+            .filter(AnalysisRequest.id == request_id),
+            current_user,
+        ).first()
+
+        if not visible:
+            raise HTTPException(404, "Request not found")
+
+    return Response(
+        content=RESULT_FILE_LIST_ADAPTER.dump_json(
+            RESULT_FILE_LIST_ADAPTER.validate_python(files, from_attributes=True)
+        ),
+        media_type="application/json",
     )
 
 
@@ -246,34 +376,29 @@ async def list_request_files(
     "/{file_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def delete_file(
+def delete_file(
     file_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_analyst),
 ):
-    file_record = (
-        db.query(ResultFile)
-        .filter(ResultFile.id == file_id)
-        .first()
-    )
+    file_record = db.get(ResultFile, file_id)
 
     if not file_record:
         raise HTTPException(404, "File not found")
 
-    path = Path(settings.UPLOAD_DIR) / file_record.file_path
-    if path.exists():
-        try:
-            path.unlink()
-        except Exception:
-            pass
+    path = _UPLOAD_ROOT / file_record.file_path
 
     db.delete(file_record)
     db.commit()
 
-    log_action(
-        db=db,
-        user=current_user,
+    # Remove from disk after the response (and only once the row is gone)
+    background_tasks.add_task(_remove_stored_file, path)
+
+    background_tasks.add_task(
+        log_action_background,
+        user_id=current_user.id,
         action="delete_file",
         entity_type="file",
         entity_id=file_id,
@@ -4,7 +4,9 @@ User management endpoints (Admin only)
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -18,17 +20,39 @@ from app.schemas.user import (
     UserResponse,
     UserListResponse,
 )
-from app.utils.audit import log_action
+from app.utils.audit import log_action_background
 
 router = APIRouter(prefix="/users", tags=["User Management"])
 
 
+def _raise_duplicate(db: Session, username: Optional[str], email: Optional[str]):
+    """
+    Translate a unique-constraint failure into the matching 400
+    (only runs after an insert/update was rejected)
+    """
+    if username and db.query(
+        db.query(User).filter(User.username == username).exists()
+    ).scalar():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered",
+        )
+
+    if email and db.query(
+        db.query(User).filter(User.email == email).exists()
+    ).scalar():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+
+
 # ============================================================
 # 🔹 CURRENT USER (MUST COME FIRST)
 # ============================================================
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -42,26 +66,13 @@ async def get_current_user_info(
 # ============================================================
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     user_data: UserCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_admin),
 ):
-    # Check if username exists
-    if db.query(User).filter(User.username == user_data.username).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered",
-        )
-
-    # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-
     user = User(
         username=user_data.username,
         email=user_data.email,
@@ -71,13 +82,19 @@ async def create_user(
         is_active=True,
     )
 
+    # Username/email are UNIQUE: insert and let the DB reject duplicates
     db.add(user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        _raise_duplicate(db, user_data.username, user_data.email)
+        raise
     db.refresh(user)
 
-    log_action(
-        db=db,
-        user=current_user,
+    background_tasks.add_task(
+        log_action_background,
+        user_id=current_user.id,
         action="create_user",
         entity_type="user",
         entity_id=user.id,
@@ -92,7 +109,7 @@ async def create_user(
 # ============================================================
 
 @router.get("/", response_model=UserListResponse)
-async def list_users(
+def list_users(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     role: Optional[str] = None,
@@ -112,11 +129,16 @@ async def list_users(
     offset = (page - 1) * page_size
     users = query.offset(offset).limit(page_size).all()
 
-    return UserListResponse(
-        users=users,
-        total=total,
-        page=page,
-        page_size=page_size,
+    # Validate the ORM rows once and dump straight to JSON
+    # (returning the model would make FastAPI validate it again)
+    return Response(
+        content=UserListResponse(
+            users=users,
+            total=total,
+            page=page,
+            page_size=page_size,
+        ).model_dump_json(),
+        media_type="application/json",
     )
 
 
@@ -125,13 +147,13 @@ async def list_users(
 # ============================================================
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_admin),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -146,14 +168,15 @@ async def get_user(
 # ============================================================
 
 @router.patch("/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     _: bool = Depends(require_admin),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,11 +186,6 @@ async def update_user(
     changes = {}
 
     if user_data.email and user_data.email != user.email:
-        if db.query(User).filter(User.email == user_data.email, User.id != user_id).first():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
         changes["email"] = {"old": user.email, "new": user_data.email}
         user.email = user_data.email
 
@@ -183,13 +201,19 @@ async def update_user(
         changes["is_active"] = {"old": user.is_active, "new": user_data.is_active}
         user.is_active = user_data.is_active
 
-    db.commit()
+    # A taken email fails the UNIQUE constraint on commit
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        _raise_duplicate(db, None, user_data.email)
+        raise
     db.refresh(user)
 
     if changes:
-        log_action(
-            db=db,
-            user=current_user,
+        background_tasks.add_task(
+            log_action_background,
+            user_id=current_user.id,
             action="update_user",
             entity_type="user",
             entity_id=user.id,
@@ -1,6 +1,7 @@
 """Application configuration using Pydantic Settings"""
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Optional, Tuple
 
 
 class Settings(BaseSettings):
@@ -8,6 +9,7 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DATABASE_URL_ASYNC: Optional[str] = None  # Defaults to DATABASE_URL with the async driver
     
     # Security
     SECRET_KEY: str
@@ -22,21 +24,40 @@ class Settings(BaseSettings):
     # File Upload
     MAX_FILE_SIZE_MB: int = 50
     UPLOAD_DIR: str = "uploads"
+    USE_XACCEL: bool = False  # Let nginx send downloads via X-Accel-Redirect
+    XACCEL_PREFIX: str = "/protected/"  # Internal nginx location aliased to UPLOAD_DIR
     
-    @property
-    def allowed_origins_list(self) -> List[str]:
-        """Convert comma-separated origins to list"""
-        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    # Derived values are computed on first use and kept (settings don't change)
+    @cached_property
+    def async_database_url(self) -> str:
+        """Database URL for the async engine (psycopg 3 async driver)"""
+        if self.DATABASE_URL_ASYNC:
+            return self.DATABASE_URL_ASYNC
+        for prefix in ("postgresql://", "postgresql+psycopg2://"):
+            if self.DATABASE_URL.startswith(prefix):
+                return "postgresql+psycopg://" + self.DATABASE_URL[len(prefix):]
+        return self.DATABASE_URL
     
-    @property
+    @cached_property
+    def allowed_origins_list(self) -> Tuple[str, ...]:
+        """Convert comma-separated origins to a tuple"""
+        return tuple(origin.strip() for origin in self.ALLOWED_ORIGINS.split(","))
+    
+    @cached_property
     def max_file_size_bytes(self) -> int:
         """Convert MB to bytes"""
-        return self.MAX_FILE_SIZE_MB * 1024 * 1024
+        return self.MAX_FILE_SIZE_MB << 20
     
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 
+@lru_cache
+def get_settings() -> Settings:
+    """Settings are read from the environment once per process"""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
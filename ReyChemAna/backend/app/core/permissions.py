@@ -1,39 +1,61 @@
 """
 Role-based access control utilities
 """
-from typing import List
+from typing import Dict, FrozenSet, List
 from fastapi import Depends, HTTPException, status
 from app.models.user import User, UserRole
 from app.dependencies import get_current_user
 
+# One bit per role; a checker keeps the OR of the roles it allows.
+# UserRole is a str enum, so plain role strings hash to the same keys.
+_ROLE_BIT = {
+    UserRole.CHEMIST: 1,
+    UserRole.ANALYST: 2,
+    UserRole.ADMIN: 4,
+}
+
+
+# Checkers interned by role set, so equal role lists share one
+# instance (and one node in FastAPI's dependency cache)
+_CHECKER_CACHE: Dict[FrozenSet[UserRole], "PermissionChecker"] = {}
+
 
 class PermissionChecker:
     """
     Dependency class for checking user permissions
     """
 
-    def __init__(self, allowed_roles: List[UserRole]):
-        self.allowed_roles = allowed_roles
+    def __new__(cls, allowed_roles: List[UserRole]):
+        key = frozenset(allowed_roles)
+        checker = _CHECKER_CACHE.get(key)
+        if checker is not None:
+            return checker
 
-    def __call__(
+        # Fixed per checker: build the role mask and 403 message once
+        checker = super().__new__(cls)
+        checker.allowed_roles = key
+        checker._mask = 0
+        for role in allowed_roles:
+            checker._mask |= _ROLE_BIT[role]
+        checker._error_detail = (
+            f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
+        )
+        return _CHECKER_CACHE.setdefault(key, checker)
+
+    async def __call__(
         self,
         current_user: User = Depends(get_current_user)
     ) -> bool:
         """
         Check if current user has required role
+        (async: no I/O here, so keep it off the threadpool)
         """
 
-        # Normalize role (safe for Enum + DB)
-        user_role = (
-            current_user.role
-            if isinstance(current_user.role, UserRole)
-            else UserRole(current_user.role)
-        )
-
-        if user_role not in self.allowed_roles:
+        # Unknown roles map to 0 and are always denied
+        if not (_ROLE_BIT.get(current_user.role, 0) & self._mask):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {[r.value for r in self.allowed_roles]}"
+                detail=self._error_detail
             )
 
         return True
@@ -0,0 +1,95 @@
+"""
+Custom response classes
+"""
+import os
+import stat
+import typing
+
+import anyio
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+PATHSEND = "http.response.pathsend"
+ZEROCOPYSEND = "http.response.zerocopysend"
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """
+    FileResponse that hands the transfer to the ASGI server when possible
+
+    If the server advertises the pathsend or zerocopysend extension the
+    file is sent by the server itself (sendfile on Linux); otherwise it
+    is streamed in chunks like FileResponse.
+
+    Callers that already opened and stat'ed the file can pass ``fd`` and
+    ``stat_result``; the response takes ownership of the descriptor and
+    closes it once sent.
+    """
+
+    def __init__(
+        self,
+        path: typing.Union[str, "os.PathLike[str]"],
+        *,
+        fd: typing.Optional[int] = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(path, **kwargs)
+        self.fd = fd
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+
+        try:
+            if self.stat_result is None:
+                try:
+                    stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+                except FileNotFoundError:
+                    raise RuntimeError(f"File at path {self.path} does not exist.")
+                if not stat.S_ISREG(stat_result.st_mode):
+                    raise RuntimeError(f"File at path {self.path} is not a file.")
+                self.set_stat_headers(stat_result)
+
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+
+            if self.send_header_only:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif PATHSEND in extensions:
+                await send({"type": PATHSEND, "path": os.path.abspath(self.path)})
+            else:
+                if self.fd is None:
+                    self.fd = await anyio.to_thread.run_sync(
+                        os.open, self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0)
+                    )
+
+                if ZEROCOPYSEND in extensions:
+                    # The extension takes a file object (fileno()), not a raw fd;
+                    # closefd=False leaves closing the descriptor to the finally below
+                    with os.fdopen(self.fd, "rb", closefd=False) as file:
+                        await send({"type": ZEROCOPYSEND, "file": file, "more_body": False})
+                else:
+                    more_body = True
+                    while more_body:
+                        chunk = await anyio.to_thread.run_sync(
+                            os.read, self.fd, self.chunk_size
+                        )
+                        more_body = len(chunk) == self.chunk_size
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": chunk,
+                                "more_body": more_body,
+                            }
+                        )
+        finally:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+        if self.background is not None:
+            await self.background()
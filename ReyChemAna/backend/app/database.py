@@ -1,23 +1,67 @@
 """Database connection and session management"""
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import Enum, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
+
+def _json_dumps(value) -> str:
+    """JSON/JSONB column serializer (orjson; the driver expects str)"""
+    return orjson.dumps(value).decode()
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG  # Log SQL queries in debug mode
+    echo=settings.DEBUG,  # Log SQL queries in debug mode
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for read-heavy endpoints that stay on the event loop
+# (the sync engine above is still used by the remaining endpoints, seeding and Alembic)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=3600,  # Recycle before server/firewall idle timeouts
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
 
+def string_enum(enum_class) -> Enum:
+    """
+    Column type for a str enum stored as its plain value in VARCHAR(20)
+    (no database ENUM type to ALTER; values map back to members on load)
+    """
+    return Enum(
+        enum_class,
+        native_enum=False,
+        create_constraint=False,
+        length=20,
+        values_callable=lambda members: [member.value for member in members],
+    )
+
+
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
@@ -25,3 +69,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
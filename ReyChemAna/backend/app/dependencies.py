@@ -1,9 +1,9 @@
 """Dependency injection for authentication and authorization"""
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.core.security import decode_access_token
 from app.models.user import User
 
@@ -11,10 +11,16 @@ security = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
 
+    # Resolved once per request; later lookups reuse it
+    cached_user: Optional[User] = getattr(request.state, "current_user", None)
+    if cached_user is not None:
+        return cached_user
+
     token = credentials.credentials
 
     payload = decode_access_token(token)
@@ -33,7 +39,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
+
+    # End the read transaction so the connection goes back to the pool;
+    # sync endpoints would otherwise hold it (idle) until teardown, after
+    # the response body and background tasks. The user stays loaded
+    # (expire_on_commit=False).
+    await db.commit()
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,4 +60,5 @@ async def get_current_user(
             detail="User account is inactive"
         )
 
+    request.state.current_user = user
     return user
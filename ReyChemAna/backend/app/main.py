@@ -1,9 +1,33 @@
 """Main FastAPI application"""
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.config import settings
-from app.api import auth, users, requests, files
-from app.api import admin_requests, admin_analytics, admin_export
+from app.api import (
+    auth_router,
+    users_router,
+    requests_router,
+    files_router,
+    admin_requests_router,
+    admin_analytics_router,
+    admin_export_router,
+)
+from app.utils.audit import flush_audit_queue, run_audit_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the batched audit writer; flush what's left on shutdown"""
+    writer = asyncio.create_task(run_audit_writer())
+    yield
+    writer.cancel()
+    with suppress(asyncio.CancelledError):
+        await writer
+    await asyncio.to_thread(flush_audit_queue)
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -11,7 +35,9 @@ app = FastAPI(
     description="Laboratory Request Management System for drug discovery labs",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -24,13 +50,13 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(auth.router, prefix="/api")
-app.include_router(users.router, prefix="/api")
-app.include_router(requests.router, prefix="/api")
-app.include_router(files.router, prefix="/api")
-app.include_router(admin_requests.router, prefix="/api")
-app.include_router(admin_analytics.router, prefix="/api")
-app.include_router(admin_export.router, prefix="/api")
+app.include_router(auth_router, prefix="/api")
+app.include_router(users_router, prefix="/api")
+app.include_router(requests_router, prefix="/api")
+app.include_router(files_router, prefix="/api")
+app.include_router(admin_requests_router, prefix="/api")
+app.include_router(admin_analytics_router, prefix="/api")
+app.include_router(admin_export_router, prefix="/api")
 
 @app.get("/")
 async def root():
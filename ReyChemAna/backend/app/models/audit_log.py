@@ -1,6 +1,7 @@
 """Audit log model for tracking user actions"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -18,7 +19,7 @@ class AuditLog(Base):
     entity_id = Column(Integer, nullable=True)  # ID of the affected entity
     
     # Additional context
-    changes = Column(JSON, nullable=True)  # JSON field for storing before/after values
+    changes = deferred(Column(JSONB, nullable=True))  # JSONB field for storing before/after values (loaded on access)
     ip_address = Column(String(50), nullable=True)
     details = Column(Text, nullable=True)  # Human-readable description
     
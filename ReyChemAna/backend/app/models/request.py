@@ -2,14 +2,22 @@
 """Analysis request and related models"""
 
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime,
-    Enum, ForeignKey, Date
+    Boolean, Column, Integer, String, Text, DateTime,
+    ForeignKey, Date, Index, Sequence, select, text
+)
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import (
+    deferred, raiseload, relationship, selectinload, undefer_group
 )
-from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from app.database import Base
+from app.database import Base, string_enum
+
+
+# Numeric part of AnalysisRequest.request_number (atomic across sessions),
+# read by the next_request_number() column default
+request_number_seq = Sequence("request_number_seq", start=1, metadata=Base.metadata)
 
 
 class Priority(str, enum.Enum):
@@ -30,40 +38,94 @@ class AnalysisRequest(Base):
     __tablename__ = "analysis_requests"
 
     id = Column(Integer, primary_key=True, index=True)
-    request_number = Column(String(20), unique=True, nullable=False, index=True)
+    request_number = Column(
+        String(20),
+        server_default=text("next_request_number()"),  # REQ-DDMONYY-NNNN
+        unique=True,
+        nullable=False,
+        index=True,
+    )
 
     chemist_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     analyst_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
+    # Copies of users.full_name for list views; a trigger on users keeps them in sync
+    chemist_name = Column(String(100), nullable=False)
+    analyst_name = Column(String(100), nullable=True)
+
     compound_name = Column(String(200), nullable=False)
-    priority = Column(Enum(Priority), nullable=False, default=Priority.MEDIUM)
+    priority = Column(string_enum(Priority), nullable=False, default=Priority.MEDIUM)
     due_date = Column(Date, nullable=False)
-    status = Column(Enum(RequestStatus), nullable=False, default=RequestStatus.PENDING)
+    status = Column(string_enum(RequestStatus), nullable=False, default=RequestStatus.PENDING)
 
-    description = Column(Text)
-    chemist_comments = Column(Text)
-    analyst_comments = Column(Text)
+    # Free text is only loaded where a response shows it (undefer_group("text"));
+    # anything else touching it raises instead of issuing a SELECT per row
+    description = deferred(Column(Text), group="text", raiseload=True)
+    chemist_comments = deferred(Column(Text), group="text", raiseload=True)
+    analyst_comments = deferred(Column(Text), group="text", raiseload=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Admin list filters, ordered like its "created_at DESC" sort
+    __table_args__ = (
+        Index("ix_req_status_created", status, created_at.desc()),
+        Index("ix_req_priority_created", priority, created_at.desc()),
+        Index("ix_req_chemist_created", chemist_id, created_at.desc()),
+        Index("ix_req_chemist_status_created", chemist_id, status, created_at.desc()),
+        Index(
+            "ix_req_analyst_created", analyst_id, created_at.desc(),
+            postgresql_where=analyst_id.isnot(None),  # Unassigned rows never match
+        ),
+        Index("ix_req_created_id", created_at.desc(), id.desc()),
+    )
+
+    # request_number/created_at come back from INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
+    # (chemist/analyst stay lazy: responses read the denormalized names)
     chemist = relationship("User", foreign_keys=[chemist_id], back_populates="chemist_requests")
     analyst = relationship("User", foreign_keys=[analyst_id], back_populates="analyst_requests")
 
+    # Collections every request response embeds: one IN query each per batch
     analysis_types = relationship(
         "RequestAnalysisType",
         back_populates="request",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="selectin"
     )
 
+    # The AnalysisType rows behind analysis_types, as a flat list
+    analysis_type_objs = association_proxy("analysis_types", "analysis_type")
+
     result_files = relationship(
         "ResultFile",
         back_populates="request",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="selectin"
     )
 
+    @classmethod
+    def response_options(cls):
+        """
+        Loader options for everything a request response reads
+        Any other relationship access raises instead of lazy-loading
+        """
+        return (
+            undefer_group("text"),
+            selectinload(cls.analysis_types)
+            .joinedload(RequestAnalysisType.analysis_type),
+            selectinload(cls.result_files),
+            raiseload("*"),
+        )
+
+    @classmethod
+    def list_query(cls):
+        """SELECT for request lists, loaded per response_options()"""
+        return select(cls).options(*cls.response_options())
+
     def __repr__(self):
         return f"<AnalysisRequest {self.request_number}>"
 
@@ -75,7 +137,12 @@ class AnalysisType(Base):
     code = Column(String(20), unique=True, nullable=False)
     name = Column(String(100), nullable=False)
     description = Column(Text)
-    is_active = Column(Integer, default=1)
+    is_active = Column(Boolean, nullable=False, server_default=text("true"))
+
+    # Active-type lookups (id IN ... AND is_active) skip retired types
+    __table_args__ = (
+        Index("ix_analysis_type_active", id, postgresql_where=is_active),
+    )
 
     request_associations = relationship(
         "RequestAnalysisType",
@@ -93,8 +160,17 @@ class RequestAnalysisType(Base):
     request_id = Column(Integer, ForeignKey("analysis_requests.id"), nullable=False)
     analysis_type_id = Column(Integer, ForeignKey("analysis_types.id"), nullable=False)
 
+    # Serves the selectin load (request_id IN ...) without touching the heap
+    __table_args__ = (
+        Index("ix_rat_request_type", request_id, analysis_type_id),
+    )
+
     request = relationship("AnalysisRequest", back_populates="analysis_types")
-    analysis_type = relationship("AnalysisType", back_populates="request_associations")
+    analysis_type = relationship(
+        "AnalysisType",
+        back_populates="request_associations",
+        lazy="joined"
+    )
 
     def __repr__(self):
         return f"<RequestAnalysisType r={self.request_id} a={self.analysis_type_id}>"
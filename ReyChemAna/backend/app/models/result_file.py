@@ -1,9 +1,9 @@
 # backend/app/models/result_file.py
 """Result file model"""
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from app.database import Base
 
@@ -27,8 +27,20 @@ class ResultFile(Base):
 
     file_name = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
+    file_type = Column(String(100), nullable=True)  # MIME type guessed at upload
+    file_size = Column(BigInteger, nullable=True)  # Bytes written at upload
+    sha256 = Column(String(64), nullable=True, index=True)  # Content hash (dedup/audit)
 
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Per-request lookups (selectin load, file list, count/max id probe)
+    __table_args__ = (
+        Index("ix_result_files_request_id", request_id, id),
+    )
+
+    # Upload responses are built right after flush: get uploaded_at back
+    # from INSERT ... RETURNING instead of a SELECT per file
+    __mapper_args__ = {"eager_defaults": True}
 
     # Relationships
     request = relationship("AnalysisRequest", back_populates="result_files")
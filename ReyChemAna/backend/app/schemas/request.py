@@ -1,5 +1,7 @@
 """Analysis request schemas"""
-from pydantic import BaseModel, Field
+from pydantic import (
+    AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+)
 from typing import Optional, List
 from datetime import datetime, date
 from app.models.request import Priority, RequestStatus
@@ -17,8 +19,7 @@ class AnalysisTypeResponse(AnalysisTypeBase):
     id: int
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 
 class ResultFileBase(BaseModel):
@@ -36,8 +37,11 @@ class ResultFileResponse(ResultFileBase):
     uploaded_by: int
     uploaded_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+
+# Built once: validates ORM rows and dumps JSON in a single pydantic-core pass
+RESULT_FILE_LIST_ADAPTER = TypeAdapter(List[ResultFileResponse])
 
 
 class RequestBase(BaseModel):
@@ -79,7 +83,10 @@ class RequestResponse(BaseModel):
     chemist_id: int
     analyst_id: Optional[int] = None
     compound_name: str
-    analysis_types: List[AnalysisTypeResponse]
+    analysis_types: List[AnalysisTypeResponse] = Field(
+        # ORM requests are read through their analysis_type_objs proxy
+        validation_alias=AliasChoices("analysis_type_objs", "analysis_types")
+    )
     priority: Priority
     due_date: date
     status: RequestStatus
@@ -95,13 +102,21 @@ class RequestResponse(BaseModel):
     analyst_name: Optional[str] = None
     result_files: List[ResultFileResponse] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+    @field_validator("analysis_types", mode="before")
+    @classmethod
+    def drop_missing_analysis_types(cls, value):
+        """Skip links whose analysis type no longer exists"""
+        return [t for t in value if t is not None]
 
 
 class RequestListResponse(BaseModel):
     """Paginated request list response"""
     requests: List[RequestResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # Not computed for cursor-paginated lists
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None  # Cursor for the following page, if any
+
+    model_config = ConfigDict(frozen=True)
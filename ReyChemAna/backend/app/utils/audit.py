@@ -1,78 +1,187 @@
 """Audit logging utilities"""
-from typing import Optional, Dict, Any
+import asyncio
+import logging
+import queue
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from app.database import SessionLocal
 from app.models.audit_log import AuditLog
-from app.models.user import User
 
+logger = logging.getLogger(__name__)
 
-def log_action(
-    db: Session,
-    user: User,
+# Pending audit rows; run_audit_writer inserts them in batches.
+# Delivery is at most once: the queue lives in process memory, so rows
+# still queued when the process crashes or is killed are lost.
+_audit_queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+_AUDIT_FLUSH_INTERVAL = 0.1  # seconds
+
+
+def flush_audit_batch(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert plain audit row dicts as one multi-row INSERT (not committed)
+    
+    Goes through Session.execute(insert(AuditLog), rows), skipping the
+    unit of work: no AuditLog objects, identity map or history tracking.
+    
+    Args:
+        db: Database session
+        rows: Column values per row ({"user_id": ..., "action": ..., ...})
+    """
+    if rows:
+        db.execute(insert(AuditLog), rows)
+
+
+def _log_dropped_entry(entry: Dict[str, Any]) -> None:
+    """Log an audit row that could not be written (call from an except block)"""
+    logger.exception(
+        "Dropped audit log row: %s %s %s",
+        entry.get("action"), entry.get("entity_type"), entry.get("entity_id"),
+    )
+
+
+def _write_audit_entries(entries: List[Dict[str, Any]]) -> int:
+    """
+    Insert audit log rows using a dedicated short-lived session
+    
+    If the batch INSERT fails, the rows are retried one at a time so a
+    single bad row doesn't take the rest of the batch with it; rows that
+    still fail are logged and dropped.
+    
+    Returns:
+        Number of audit rows written
+    """
+    db = SessionLocal()
+    try:
+        try:
+            flush_audit_batch(db, entries)
+            db.commit()
+            return len(entries)
+        except Exception:
+            db.rollback()
+            if len(entries) == 1:
+                _log_dropped_entry(entries[0])
+                return 0
+            logger.warning("Audit log batch failed, retrying %d rows one by one", len(entries))
+
+        written = 0
+        for entry in entries:
+            try:
+                flush_audit_batch(db, [entry])
+                db.commit()
+                written += 1
+            except Exception:
+                db.rollback()
+                _log_dropped_entry(entry)
+        return written
+    finally:
+        db.close()
+
+
+def _enqueue_audit_entries(entries: List[Dict[str, Any]]) -> None:
+    """Queue audit rows for the writer, stamped with the time of the action"""
+    now = datetime.now(timezone.utc)
+    for entry in entries:
+        entry.setdefault("created_at", now)
+        _audit_queue.put(entry)
+
+
+def flush_audit_queue() -> int:
+    """
+    Insert everything queued so far in one batch
+    
+    Returns:
+        Number of audit rows written (rows that failed on their own are
+        logged and not counted)
+    """
+    batch = []
+    while True:
+        try:
+            batch.append(_audit_queue.get_nowait())
+        except queue.Empty:
+            break
+
+    if not batch:
+        return 0
+    return _write_audit_entries(batch)
+
+
+async def run_audit_writer(interval: float = _AUDIT_FLUSH_INTERVAL) -> None:
+    """
+    Drain the audit queue every `interval` seconds until cancelled
+    
+    Started from the app lifespan; the insert runs in a worker thread
+    so the event loop never waits on it. Delivery is at most once: a
+    batch that can't be written (even row by row) is logged and dropped,
+    and anything still queued is lost if the process dies.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if _audit_queue.empty():
+            continue
+        try:
+            await asyncio.to_thread(flush_audit_queue)
+        except Exception:
+            logger.exception("Failed to write audit log batch")
+
+
+def log_action_background(
+    user_id: int,
     action: str,
     entity_type: str,
     entity_id: Optional[int] = None,
     changes: Optional[Dict[str, Any]] = None,
     details: Optional[str] = None,
     ip_address: Optional[str] = None
-) -> AuditLog:
+) -> None:
     """
-    Create an audit log entry
+    Queue an audit log entry, written outside the request's session
+    
+    Meant to be scheduled with BackgroundTasks; run_audit_writer
+    inserts queued entries in batches.
     
     Args:
-        db: Database session
-        user: User performing the action
-        action: Action name (e.g., "create_request", "status_change")
-        entity_type: Type of entity affected (e.g., "request", "user")
+        user_id: ID of the user performing the action
+        action: Action name (e.g., "login", "download_file")
+        entity_type: Type of entity affected (e.g., "user", "file")
         entity_id: ID of the affected entity
         changes: Dictionary of changes (before/after)
         details: Human-readable description
         ip_address: IP address of the user
-    
-    Returns:
-        Created audit log entry
     """
-    audit_log = AuditLog(
-        user_id=user.id,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        changes=changes,
-        details=details,
-        ip_address=ip_address
-    )
-    
-    db.add(audit_log)
-    db.commit()
-    db.refresh(audit_log)
-    
-    return audit_log
+    _enqueue_audit_entries([{
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "changes": changes,
+        "details": details,
+        "ip_address": ip_address,
+    }])
 
 
-def log_status_change(
-    db: Session,
-    user: User,
+def log_status_change_background(
+    user_id: int,
     request_id: int,
     old_status: str,
     new_status: str,
     ip_address: Optional[str] = None
-) -> AuditLog:
+) -> None:
     """
-    Log a request status change
+    Log a request status change outside the request's session
+    
+    Meant to be scheduled with BackgroundTasks, like log_action_background.
     
     Args:
-        db: Database session
-        user: User making the change
+        user_id: ID of the user making the change
         request_id: ID of the request
         old_status: Previous status
         new_status: New status
         ip_address: IP address
-    
-    Returns:
-        Created audit log entry
     """
-    return log_action(
-        db=db,
-        user=user,
+    log_action_background(
+        user_id=user_id,
         action="status_change",
         entity_type="request",
         entity_id=request_id,
@@ -82,32 +191,31 @@ def log_status_change(
     )
 
 
-def log_file_upload(
-    db: Session,
-    user: User,
+def log_file_uploads_background(
+    user_id: int,
     request_id: int,
-    file_name: str,
+    file_names: List[str],
     ip_address: Optional[str] = None
-) -> AuditLog:
+) -> None:
     """
-    Log a file upload
+    Log several file uploads (queued together, one batch insert)
+    
+    Meant to be scheduled with BackgroundTasks, like log_action_background.
     
     Args:
-        db: Database session
-        user: User uploading the file
+        user_id: ID of the user uploading the files
         request_id: ID of the request
-        file_name: Name of uploaded file
+        file_names: Names of uploaded files
         ip_address: IP address
-    
-    Returns:
-        Created audit log entry
     """
-    return log_action(
-        db=db,
-        user=user,
-        action="upload_file",
-        entity_type="file",
-        entity_id=request_id,
-        details=f"File uploaded: {file_name}",
-        ip_address=ip_address
-    )
+    _enqueue_audit_entries([
+        {
+            "user_id": user_id,
+            "action": "upload_file",
+            "entity_type": "file",
+            "entity_id": request_id,
+            "details": f"File uploaded: {file_name}",
+            "ip_address": ip_address,
+        }
+        for file_name in file_names
+    ])
@@ -5,6 +5,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.database import engine, SessionLocal
 from app.models.user import User, UserRole
@@ -13,12 +14,7 @@ from app.core.security import get_password_hash
 
 
 def create_default_users(db: Session):
-    """Create default users for each role"""
-    
-    # Check if users already exist
-    if db.query(User).count() > 0:
-        print("Users already exist, skipping user creation")
-        return
+    """Create default users for each role (existing usernames are kept)"""
     
     users = [
         {
@@ -58,29 +54,40 @@ def create_default_users(db: Session):
         }
     ]
     
+    # bcrypt is slow on purpose: hash each distinct password only once
+    password_hashes = {}
+    rows = []
+    
     for user_data in users:
-        user = User(
-            username=user_data["username"],
-            email=user_data["email"],
-            password_hash=get_password_hash(user_data["password"]),
-            full_name=user_data["full_name"],
-            role=user_data["role"],
-            is_active=True
-        )
-        db.add(user)
-        print(f"Created user: {user.username} ({user.role.value})")
+        password = user_data["password"]
+        if password not in password_hashes:
+            password_hashes[password] = get_password_hash(password)
+        
+        rows.append({
+            "username": user_data["username"],
+            "email": user_data["email"],
+            "password_hash": password_hashes[password],
+            "full_name": user_data["full_name"],
+            "role": user_data["role"],
+            "is_active": True
+        })
     
+    # One idempotent INSERT for all users: re-running the seed is a no-op
+    created = db.scalars(
+        pg_insert(User)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["username"])
+        .returning(User.username)
+    ).all()
     db.commit()
-    print(f"\nCreated {len(users)} users successfully")
+    
+    for username in created:
+        print(f"Created user: {username}")
+    print(f"\nCreated {len(created)} users ({len(users) - len(created)} already existed)")
 
 
 def create_analysis_types(db: Session):
-    """Create standard analysis types"""
-    
-    # Check if analysis types already exist
-    if db.query(AnalysisType).count() > 0:
-        print("Analysis types already exist, skipping creation")
-        return
+    """Create standard analysis types (existing codes are kept)"""
     
     analysis_types = [
         {
@@ -135,18 +142,28 @@ def create_analysis_types(db: Session):
         }
     ]
     
-    for type_data in analysis_types:
-        analysis_type = AnalysisType(
-            code=type_data["code"],
-            name=type_data["name"],
-            description=type_data["description"],
-            is_active=1
-        )
-        db.add(analysis_type)
-        print(f"Created analysis type: {analysis_type.code}")
+    rows = [
+        {
+            "code": type_data["code"],
+            "name": type_data["name"],
+            "description": type_data["description"],
+            "is_active": True
+        }
+        for type_data in analysis_types
+    ]
     
+    # One idempotent INSERT for all analysis types: re-running the seed is a no-op
+    created = db.scalars(
+        pg_insert(AnalysisType)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["code"])
+        .returning(AnalysisType.code)
+    ).all()
     db.commit()
-    print(f"\nCreated {len(analysis_types)} analysis types successfully")
+    
+    for code in created:
+        print(f"Created analysis type: {code}")
+    print(f"\nCreated {len(created)} analysis types ({len(analysis_types) - len(created)} already existed)")
 
 
 def main():
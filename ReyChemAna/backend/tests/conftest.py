@@ -0,0 +1,172 @@
+"""
+Test setup: the app runs against a throwaway SQLite database
+
+Settings are read (and the engines created) when app.database is first
+imported, so the environment is set up before any app import below.
+"""
+import itertools
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="lims-tests-"))
+_DB_PATH = _TMP_DIR / "test.db"
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["DATABASE_URL_ASYNC"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["UPLOAD_DIR"] = str(_TMP_DIR / "uploads")
+os.environ["MAX_FILE_SIZE_MB"] = "1"
+
+# SQLite's async driver runs on NullPool, which takes no pool sizing
+import sqlalchemy.ext.asyncio as sa_asyncio  # noqa: E402
+
+_create_async_engine = sa_asyncio.create_async_engine
+
+
+def _create_sqlite_async_engine(url, **kwargs):
+    for key in ("pool_size", "max_overflow", "pool_recycle"):
+        kwargs.pop(key, None)
+    return _create_async_engine(url, **kwargs)
+
+
+sa_asyncio.create_async_engine = _create_sqlite_async_engine
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.dialects.postgresql import JSONB  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import AnalysisRequest, AnalysisType  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+
+# ---- PostgreSQL-only schema pieces, mapped onto SQLite ----
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+# request_number comes from a plpgsql function default in PostgreSQL
+AnalysisRequest.__table__.c.request_number.server_default = None
+_request_numbers = itertools.count(1)
+
+
+@event.listens_for(AnalysisRequest, "before_insert")
+def _fill_request_number(mapper, connection, target):
+    if target.request_number is None:
+        target.request_number = (
+            f"REQ-{datetime.utcnow():%d%b%y}-{next(_request_numbers):04d}".upper()
+        )
+
+
+# ---- Fixtures ----
+
+USERS = {
+    "admin": UserRole.ADMIN,
+    "chemist": UserRole.CHEMIST,
+    "analyst": UserRole.ANALYST,
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once, with one user per role and a few analysis types"""
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    password_hash = get_password_hash("password")
+    for username, role in USERS.items():
+        db.add(User(
+            username=username,
+            email=f"{username}@lab.com",
+            password_hash=password_hash,
+            full_name=username.title(),
+            role=role,
+            is_active=True,
+        ))
+    for code in ("HPLC", "NMR", "LCMS"):
+        db.add(AnalysisType(code=code, name=code, is_active=True))
+    db.commit()
+    db.close()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def auth_headers(database):
+    """auth_headers("chemist") -> Authorization header for that seeded user"""
+    db = SessionLocal()
+    users = {user.username: user for user in db.query(User).all()}
+    db.close()
+
+    def _headers(username: str) -> dict:
+        user = users[username]
+        token = create_access_token(
+            {"user_id": user.id, "username": user.username, "role": user.role.value}
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    return _headers
+
+
+@pytest.fixture(scope="session")
+def create_requests(client, auth_headers):
+    """create_requests(n) -> ids of n new requests made by the chemist"""
+    def _create(count: int):
+        ids = []
+        for i in range(count):
+            response = client.post(
+                "/api/requests/",
+                headers=auth_headers("chemist"),
+                json={
+                    "compound_name": f"Compound {i}",
+                    "analysis_type_ids": [1, 2],
+                    "due_date": "2030-01-01",
+                },
+            )
+            assert response.status_code == 201, response.text
+            ids.append(response.json()["id"])
+        return ids
+
+    return _create
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Count SQL statements sent on both engines:
+
+        with count_queries() as statements:
+            ...
+        assert len(statements) <= 5
+    """
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engines = (engine, async_engine.sync_engine)
+        for target in engines:
+            event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            for target in engines:
+                event.remove(target, "before_cursor_execute", _before_cursor_execute)
+
+    return _count
@@ -0,0 +1,42 @@
+"""Conditional GET helpers for request endpoints"""
+import pytest
+
+from app.api.requests import _etag_matches, _weak_etag
+
+ETAG = _weak_etag("request", 1)
+
+
+def test_weak_etag_is_stable_and_weak():
+    assert ETAG == _weak_etag("request", 1)
+    assert ETAG != _weak_etag("request", 2)
+    assert ETAG.startswith('W/"') and ETAG.endswith('"')
+
+
+@pytest.mark.parametrize("if_none_match", [
+    ETAG,
+    ETAG.removeprefix("W/"),
+    f'W/"other", {ETAG}',
+    f'"other",{ETAG.removeprefix("W/")} ',
+    "*",
+])
+def test_etag_matches(if_none_match):
+    assert _etag_matches(if_none_match, ETAG)
+
+
+@pytest.mark.parametrize("if_none_match", [None, "", 'W/"other"', '"a", "b"'])
+def test_etag_does_not_match(if_none_match):
+    assert not _etag_matches(if_none_match, ETAG)
+
+
+def test_get_request_304(client, auth_headers, create_requests):
+    (request_id,) = create_requests(1)
+    headers = auth_headers("chemist")
+
+    first = client.get(f"/api/requests/{request_id}", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get(
+        f"/api/requests/{request_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert second.status_code == 304
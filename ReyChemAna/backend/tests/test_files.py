@@ -0,0 +1,45 @@
+"""Upload storage helpers"""
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.api.files import _save_upload
+from app.config import settings
+
+
+def _upload(data: bytes, size=None) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="result.pdf", size=size)
+
+
+def test_save_upload_hashes_while_copying(tmp_path):
+    target = tmp_path / "result.pdf"
+
+    written, digest = _save_upload(_upload(b"spectrum"), target)
+
+    assert written == 8
+    assert target.read_bytes() == b"spectrum"
+    assert digest == hashlib.sha256(b"spectrum").hexdigest()
+
+
+def test_oversize_upload_is_413_and_leaves_no_partial_file(tmp_path):
+    target = tmp_path / "result.pdf"
+    data = b"x" * (settings.max_file_size_bytes + 1)
+
+    # Size unknown up front: the limit is hit while copying
+    with pytest.raises(HTTPException) as exc_info:
+        _save_upload(_upload(data), target)
+
+    assert exc_info.value.status_code == 413
+    assert not target.exists()
+
+
+def test_declared_oversize_upload_is_rejected_before_writing(tmp_path):
+    target = tmp_path / "result.pdf"
+
+    with pytest.raises(HTTPException) as exc_info:
+        _save_upload(_upload(b"", size=settings.max_file_size_bytes + 1), target)
+
+    assert exc_info.value.status_code == 413
+    assert not target.exists()
@@ -0,0 +1,33 @@
+"""Keyset cursor encoding"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "%%%", encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+def test_bad_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("url", ["/api/requests/", "/api/admin/requests/"])
+def test_list_rejects_bad_cursor(client, auth_headers, url):
+    response = client.get(url, headers=auth_headers("admin"), params={"cursor": "garbage"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
@@ -0,0 +1,43 @@
+"""Role checkers"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.permissions import (
+    PermissionChecker,
+    require_admin,
+    require_analyst,
+    require_any_role,
+    require_chemist,
+)
+from app.models.user import User, UserRole
+
+
+def test_checkers_are_interned_by_role_set():
+    assert PermissionChecker([UserRole.ADMIN]) is require_admin
+    assert PermissionChecker([UserRole.ADMIN, UserRole.CHEMIST]) is require_chemist
+    assert PermissionChecker(
+        [UserRole.ADMIN, UserRole.ANALYST, UserRole.CHEMIST]
+    ) is require_any_role
+    assert PermissionChecker([UserRole.ANALYST]) is not require_analyst
+
+
+@pytest.mark.parametrize("checker, role, allowed", [
+    (require_admin, UserRole.ADMIN, True),
+    (require_admin, UserRole.CHEMIST, False),
+    (require_chemist, UserRole.CHEMIST, True),
+    (require_chemist, UserRole.ANALYST, False),
+    (require_analyst, UserRole.ANALYST, True),
+    (require_analyst, UserRole.ADMIN, True),
+    (require_any_role, UserRole.CHEMIST, True),
+])
+def test_checker_allows_roles(checker, role, allowed):
+    user = User(username="u", role=role)
+
+    if allowed:
+        assert asyncio.run(checker(user)) is True
+    else:
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(checker(user))
+        assert exc_info.value.status_code == 403
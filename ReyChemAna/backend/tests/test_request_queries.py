@@ -0,0 +1,60 @@
+"""Request lists load with a fixed number of queries, whatever the page size"""
+import pytest
+
+from app.database import SessionLocal
+from app.models import ResultFile
+
+MAX_LIST_QUERIES = 5
+
+
+@pytest.fixture(scope="module")
+def requests_with_files(create_requests):
+    """12 requests, each with two analysis types and a result file"""
+    ids = create_requests(12)
+
+    db = SessionLocal()
+    for request_id in ids:
+        db.add(ResultFile(
+            request_id=request_id,
+            file_name="result.pdf",
+            file_path=f"test/{request_id}/result.pdf",
+            uploaded_by=1,
+        ))
+    db.commit()
+    db.close()
+    return set(ids)
+
+
+@pytest.mark.parametrize("url", ["/api/requests/", "/api/admin/requests/"])
+@pytest.mark.parametrize("page_size", [2, 10, 50])
+def test_list_query_count(
+    client, auth_headers, requests_with_files, count_queries, url, page_size
+):
+    headers = auth_headers("admin")
+
+    with count_queries() as statements:
+        response = client.get(url, headers=headers, params={"page_size": page_size})
+
+    assert response.status_code == 200, response.text
+    rows = response.json()["requests"]
+    assert len(rows) == page_size or response.json()["next_cursor"] is None
+    assert all(
+        row["analysis_types"] and row["result_files"]
+        for row in rows if row["id"] in requests_with_files
+    )
+    assert len(statements) <= MAX_LIST_QUERIES, statements
+
+
+def test_list_query_count_with_total(
+    client, auth_headers, requests_with_files, count_queries
+):
+    headers = auth_headers("chemist")
+
+    with count_queries() as statements:
+        response = client.get(
+            "/api/requests/", headers=headers, params={"include_total": True}
+        )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["total"] >= 12
+    assert len(statements) <= MAX_LIST_QUERIES, statements